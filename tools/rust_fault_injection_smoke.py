@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Smoke test for the fault-injection hooks in a fault-enabled arsw build.
+
+A build made with ``--features fault_injection`` consults
+``sys.apsw_should_fault`` before every named fault site and
+``sys.apsw_fault_inject_control`` at every low level control point.  This
+script installs both hooks, arms each named fault in turn, and verifies the
+documented exception surfaces in Python.
+
+Usage::
+
+    python tools/rust_fault_injection_smoke.py [build-dir]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import sys
+from pathlib import Path
+
+# Named faults grouped by the fixture they need.  Keep in sync with
+# src/faultinject.rs.
+VFS_NAMED_FAULTS = frozenset({
+    "VFSOpenFails",
+    "VFSDeleteFails",
+    "VFSAccessFails",
+    "VFSFullPathnameFails",
+    "VFSDlOpenFails",
+    "VFSCurrentTimeFails",
+})
+
+TOKENIZER_NAMED_FAULTS = frozenset({
+    "FTS5TokenizerCreateFails",
+    "FTS5TokenizeFails",
+    "FTS5TokenizerCallbackFails",
+})
+
+ALL_NAMED_FAULTS = frozenset({
+    "ConnectionAsyncTpNewFails",
+    "ConnectionOpenFails",
+    "ConnectionCloseFails",
+    "ConnectionReadError",
+    "ConnectionExecFails",
+    "CursorPrepareFails",
+    "CursorStepFails",
+    "BlobOpenFails",
+    "BlobReadFails",
+    "BlobWriteTooBig",
+    "BackupInitFails",
+    "WalCheckpointFails",
+    "FTS5TokenizerRegister",
+}) | VFS_NAMED_FAULTS | TOKENIZER_NAMED_FAULTS
+
+
+@functools.lru_cache(maxsize=None)
+def load_apsw_module(build_dir: str):
+    """Import apsw, preferring a fault-enabled build under *build_dir*.
+
+    Memoized so a driver running several smoke scripts in one process
+    pays the import once per build directory.
+    """
+    sys.path.insert(0, build_dir)
+    try:
+        import apsw
+    finally:
+        sys.path.pop(0)
+    return apsw
+
+
+def _simple_tokenizer(con, args):
+    def tokenize(utf8, flags, locale):
+        offset = 0
+        for word in utf8.split():
+            start = utf8.index(word, offset)
+            offset = start + len(word)
+            yield start, offset, word.decode("utf8")
+
+    return tokenize
+
+
+class _FIState:
+    """State shared with the fault hooks.
+
+    The hooks run at every injection site — hundreds of times per
+    Connection("") — so they live here as bound methods reading slotted
+    attributes, which is cheaper than the closure cell loads they would
+    pay as nested functions, and keeps them picklable.
+    """
+
+    __slots__ = (
+        "seen_fault_names",
+        "seen_control_apis",
+        "should_fault_names",
+        "control_overrides",
+    )
+
+    def __init__(self) -> None:
+        self.seen_fault_names: list[str] = []
+        self.seen_control_apis: list[str] = []
+        self.should_fault_names: set[str] = set()
+        self.control_overrides: dict[str, tuple[int, str]] = {}
+
+    def apsw_should_fault(self, name: str, pending: object) -> bool:
+        self.seen_fault_names.append(name)
+        return name in self.should_fault_names
+
+    def apsw_fault_inject_control(self, key: object) -> object:
+        # The element types are guaranteed by the Rust caller's tuple
+        # layout, so only the unpack keeps a real error; the per-element
+        # checks are asserts that vanish under -O.
+        try:
+            filename, funcname, lineno, callname, callcount = key
+        except (TypeError, ValueError):
+            raise TypeError(
+                f"fault control key must be a 5-tuple, got {key!r}"
+            ) from None
+        if __debug__:
+            assert isinstance(filename, str), f"filename must be str, got {filename!r}"
+            assert isinstance(funcname, str), f"funcname must be str, got {funcname!r}"
+            assert isinstance(lineno, int), f"lineno must be int, got {lineno!r}"
+            assert isinstance(callname, str), f"callname must be str, got {callname!r}"
+            assert isinstance(callcount, int), f"callcount must be int, got {callcount!r}"
+        self.seen_control_apis.append(callname)
+        return self.control_overrides.get(callname)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "build_dir",
+        nargs="?",
+        type=Path,
+        default=Path("."),
+        help="directory containing the fault-enabled apsw package",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    apsw = load_apsw_module(str(args.build_dir))
+
+    failures: list[tuple[str, str]] = []
+    state = _FIState()
+
+    def expect_raises(fault_name: str, exc_type: type[BaseException], func) -> bool:
+        # The try/except here is the expected signal, not error handling:
+        # the armed fault must surface as exc_type.
+        state.should_fault_names.add(fault_name)
+        try:
+            func()
+        except exc_type:
+            return True
+        except Exception as exc:
+            failures.append((fault_name, f"expected {exc_type.__name__}, got {exc!r}"))
+            return False
+        finally:
+            state.should_fault_names.discard(fault_name)
+        failures.append((fault_name, "no exception raised"))
+        return False
+
+    # Shared fixtures: every Connection("") re-runs sqlite3_open_v2 and VFS
+    # setup, so cases whose subject is not connection creation itself reuse
+    # one connection per category.  The creation-path cases (async tp,
+    # open, close, VFS) still open their own.
+    plain_con = apsw.Connection("")
+    plain_con.execute("pragma journal_mode=wal")
+    plain_con.execute("create table t(x); insert into t values(1)")
+    blob_con = apsw.Connection("")
+    blob_con.execute("create table b(v)")
+    tokenizer_con = apsw.Connection("")
+    tokenizer_con.register_fts5_tokenizer("smoke", _simple_tokenizer)
+    tokenizer_con.execute("create virtual table ft using fts5(t, tokenize='smoke')")
+    backup_con = apsw.Connection("")
+
+    def _blob_fixture():
+        blob_con.execute("insert into b values(zeroblob(1024))")
+        return blob_con, blob_con.last_insert_rowid()
+
+    # Exception classes bound once; the case builders close over locals
+    # instead of repeating attribute lookups on the apsw module.
+    ApswError = apsw.Error
+    ApswIOError = apsw.IOError
+    CantOpenError = apsw.CantOpenError
+    SQLError = apsw.SQLError
+    TooBigError = apsw.TooBigError
+
+    # Case builders: each returns (func, expected exception) for one named
+    # fault, doing its fixture setup up front while no fault is armed.
+
+    def _case_async_tp():
+        return lambda: apsw.Connection(""), MemoryError
+
+    def _case_open():
+        return lambda: apsw.Connection(""), CantOpenError
+
+    def _case_close():
+        con = apsw.Connection("")
+        return con.close, ApswIOError
+
+    def _case_read_error():
+        return lambda: plain_con.execute("select * from t").fetchall(), ApswIOError
+
+    def _case_exec():
+        return lambda: plain_con.execute("select 1"), SQLError
+
+    def _case_cursor_prepare():
+        return lambda: plain_con.cursor().execute("select 1"), ApswError
+
+    def _case_cursor_step():
+        return lambda: plain_con.cursor().execute("select 1").fetchall(), ApswError
+
+    def _case_blob_open():
+        con, rowid = _blob_fixture()
+        return lambda: con.blobopen("main", "b", "v", rowid, True), ApswError
+
+    def _case_blob_read():
+        con, rowid = _blob_fixture()
+        blob = con.blobopen("main", "b", "v", rowid, False)
+        return blob.read, ApswIOError
+
+    def _case_blob_write_too_big():
+        con, rowid = _blob_fixture()
+        blob = con.blobopen("main", "b", "v", rowid, True)
+        return lambda: blob.write(b"x" * 1024), TooBigError
+
+    def _case_backup_init():
+        return lambda: backup_con.backup("main", plain_con, "main"), ApswError
+
+    def _case_wal_checkpoint():
+        return plain_con.wal_checkpoint, ApswError
+
+    def _case_tokenizer_register():
+        return (
+            lambda: tokenizer_con.register_fts5_tokenizer("smoke2", _simple_tokenizer),
+            ApswError,
+        )
+
+    def _case_vfs():
+        return (
+            lambda: apsw.Connection("").execute("create table t(x)"),
+            ApswIOError,
+        )
+
+    def _case_tokenizer():
+        return (
+            lambda: tokenizer_con.execute("insert into ft values('one two three')"),
+            ApswError,
+        )
+
+    # Dispatch table: one case builder per named fault, built once.  The VFS
+    # and tokenizer groups share a builder each.
+    builders = {
+        "ConnectionAsyncTpNewFails": _case_async_tp,
+        "ConnectionOpenFails": _case_open,
+        "ConnectionCloseFails": _case_close,
+        "ConnectionReadError": _case_read_error,
+        "ConnectionExecFails": _case_exec,
+        "CursorPrepareFails": _case_cursor_prepare,
+        "CursorStepFails": _case_cursor_step,
+        "BlobOpenFails": _case_blob_open,
+        "BlobReadFails": _case_blob_read,
+        "BlobWriteTooBig": _case_blob_write_too_big,
+        "BackupInitFails": _case_backup_init,
+        "WalCheckpointFails": _case_wal_checkpoint,
+        "FTS5TokenizerRegister": _case_tokenizer_register,
+    }
+    builders.update(dict.fromkeys(VFS_NAMED_FAULTS, _case_vfs))
+    builders.update(dict.fromkeys(TOKENIZER_NAMED_FAULTS, _case_tokenizer))
+    missing = ALL_NAMED_FAULTS - builders.keys()
+    if missing:
+        raise SystemExit(f"no case builder for named faults: {sorted(missing)}")
+
+    prev_should = getattr(sys, "apsw_should_fault", None)
+    prev_control = getattr(sys, "apsw_fault_inject_control", None)
+    sys.apsw_should_fault = state.apsw_should_fault
+    sys.apsw_fault_inject_control = state.apsw_fault_inject_control
+    try:
+        cases = [
+            (fault_name, *builders[fault_name]())
+            for fault_name in sorted(ALL_NAMED_FAULTS)
+        ]
+        for fault_name, func, exc_type in cases:
+            expect_raises(fault_name, exc_type, func)
+    finally:
+        if prev_should is None:
+            del sys.apsw_should_fault
+        else:
+            sys.apsw_should_fault = prev_should
+        if prev_control is None:
+            del sys.apsw_fault_inject_control
+        else:
+            sys.apsw_fault_inject_control = prev_control
+
+    print(
+        f"exercised {len(ALL_NAMED_FAULTS)} named faults, "
+        f"{len(state.seen_fault_names)} should-fault callbacks, "
+        f"{len(state.seen_control_apis)} control callbacks"
+    )
+    for fault_name, detail in failures:
+        print(f"FAIL {fault_name}: {detail}", file=sys.stderr)
+    unseen = ALL_NAMED_FAULTS - set(state.seen_fault_names)
+    if unseen:
+        print(f"named faults never consulted: {sorted(unseen)}", file=sys.stderr)
+        return 1
+    if failures:
+        return 1
+    print("ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Phase 0 of the Rust migration: snapshot the reference apsw surface.
+
+Writes machine readable snapshots of the public API, the exception
+hierarchy and the SQLITE_* constants of the C build, plus an inventory of
+build-time generated artifacts, so later phases can diff the Rust build
+against a fixed baseline.
+
+Usage::
+
+    python tools/rust_migration_phase0.py --all
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+OUTPUT_DIR = Path(__file__).resolve().parent.parent / "migration" / "phase0"
+
+# (artifact, generator, consumer) for every file the C build generates.
+GENERATED_ARTIFACTS = [
+    ("src/apswversion.h", "setup.py", "compile-time version stamps"),
+    ("src/constants.c", "tools/genconstants.py", "module constant registration"),
+    ("src/stringconstants.c", "tools/genstrings.py", "interned string table"),
+    ("apsw/__init__.pyi", "tools/genpyi.py", "type stubs"),
+    ("doc/example.rst", "tools/example2rst.py", "documentation example"),
+]
+
+
+# Types a module-level UPPERCASE name must have to count as a constant.
+CONST_TYPES = (int, float, str, bool, type(None))
+
+SCALAR_TYPES = CONST_TYPES + (bytes, bytearray, memoryview)
+CONTAINER_TYPES = (tuple, list, dict, set, frozenset)
+
+
+def fq_name(obj) -> str:
+    """Best-effort fully qualified type name for *obj*."""
+    t = type(obj)
+    return f"{t.__module__}.{t.__qualname__}"
+
+
+# Memoization for the introspection helpers, keyed by id(obj).  apsw
+# exports many aliases to the same C functions; caching means each shared
+# object is probed once per run.  The snapshotted objects are module and
+# class attributes that stay alive for the run, so ids are stable.
+_kind_cache: dict[int, str] = {}
+_sig_cache: dict[int, str | None] = {}
+
+
+def classify_member(obj) -> str:
+    key = id(obj)
+    if key in _kind_cache:
+        return _kind_cache[key]
+    _kind_cache[key] = kind = _classify_member(obj)
+    return kind
+
+
+def _classify_member(obj) -> str:
+    # A class check must come first (classes are callable); after that a
+    # single callable() covers builtins, functions and descriptors alike.
+    if isinstance(obj, type):
+        return "class"
+    if callable(obj):
+        return "callable"
+    if isinstance(obj, SCALAR_TYPES):
+        return "scalar"
+    if isinstance(obj, CONTAINER_TYPES):
+        return "container"
+    return fq_name(obj)
+
+
+def safe_signature(obj) -> str | None:
+    key = id(obj)
+    if key in _sig_cache:
+        return _sig_cache[key]
+    import inspect
+
+    try:
+        sig = str(inspect.signature(obj))
+    except (TypeError, ValueError):
+        sig = None
+    _sig_cache[key] = sig
+    return sig
+
+
+def class_members(klass) -> dict[str, list]:
+    """Categorize the attributes of *klass* into the snapshot buckets.
+
+    Walks ``__mro__`` once, merging each base's ``__dict__`` into a
+    single mapping, so no per-name MRO search is needed.  Updating from
+    the reversed MRO lets later (earlier-in-lookup-order) bases
+    overwrite in bulk at C speed instead of one setdefault per name.
+    """
+    import inspect
+
+    accumulated: dict[str, object] = {}
+    for base in reversed(klass.__mro__):
+        accumulated.update(base.__dict__)
+
+    methods, getsets, data, other = [], [], [], []
+    for name in sorted(accumulated):
+        if name.startswith("_") and not name.startswith("__"):
+            continue
+        obj = accumulated[name]
+        if callable(obj):
+            methods.append({"name": name, "signature": safe_signature(obj)})
+        elif inspect.isgetsetdescriptor(obj) or inspect.ismemberdescriptor(obj) or isinstance(obj, property):
+            getsets.append(name)
+        elif isinstance(obj, (int, float, str, bool, bytes, type(None))):
+            data.append({"name": name, "value": repr(obj)})
+        else:
+            other.append({"name": name, "type": fq_name(obj)})
+    return {"methods": methods, "getsets": getsets, "data": data, "other": other}
+
+
+def snapshot_public_surface() -> dict:
+    import apsw
+
+    classes: dict[str, dict] = {}
+    functions: dict[str, str | None] = {}
+    constants: dict[str, object] = {}
+    other: dict[str, dict] = {}
+    # Single pass: classify each member once and branch on the kind,
+    # rather than re-probing with isclass/callable/isinstance in turn.
+    for name in sorted(dir(apsw)):
+        if name.startswith("_"):
+            continue
+        obj = getattr(apsw, name)
+        kind = classify_member(obj)
+        if kind == "class":
+            classes[name] = class_members(obj)
+        elif kind == "callable":
+            functions[name] = safe_signature(obj)
+        elif name.isupper() and isinstance(obj, CONST_TYPES):
+            constants[name] = obj
+        else:
+            other[name] = {"kind": kind, "repr": repr(obj)}
+    return {
+        "module": "apsw",
+        "apsw_version": apsw.apswversion(),
+        "sqlite_version": apsw.sqlitelibversion(),
+        "classes": classes,
+        "functions": functions,
+        "constants": constants,
+        "other": other,
+    }
+
+
+def snapshot_exception_hierarchy() -> dict:
+    import inspect
+
+    import apsw
+
+    out: dict[str, list[str]] = {}
+    for name in sorted(dir(apsw)):
+        obj = getattr(apsw, name)
+        if inspect.isclass(obj) and issubclass(obj, Exception):
+            out[name] = [base.__name__ for base in obj.__mro__[1:-1]]
+    return out
+
+
+def snapshot_binding_constants() -> dict:
+    import apsw
+
+    return {
+        name: getattr(apsw, name)
+        for name in sorted(dir(apsw))
+        if name.startswith("SQLITE_")
+    }
+
+
+_ARTIFACTS_HEADER = """\
+# Generated artifacts
+
+Files the C build generates at build time, and what consumes them.
+The Rust build must either reproduce or retire each one.
+
+| Artifact | Generator | Consumer |
+| --- | --- | --- |
+"""
+
+
+def snapshot_generated_artifacts(output: Path) -> None:
+    import io
+
+    buf = io.StringIO()
+    buf.write(_ARTIFACTS_HEADER)
+    for artifact, generator, consumer in GENERATED_ARTIFACTS:
+        buf.write(f"| `{artifact}` | `{generator}` | `{consumer}` |\n")
+    output.write_text(buf.getvalue(), encoding="utf8")
+
+
+def write_json(path: Path, payload) -> None:
+    import json
+    import os
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Stream straight to disk rather than building the whole document as a
+    # str first; write to a sibling tmp file so a crash never leaves a
+    # truncated snapshot behind.
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf8") as fp:
+        json.dump(payload, fp, indent=2, sort_keys=True)
+        fp.write("\n")
+    os.replace(tmp, path)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--public-surface", action="store_true")
+    parser.add_argument("--exceptions", action="store_true")
+    parser.add_argument("--constants", action="store_true")
+    parser.add_argument("--generated-artifacts", action="store_true")
+    parser.add_argument("--all", action="store_true")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args(argv)
+    if not any(
+        (args.public_surface, args.exceptions, args.constants, args.generated_artifacts)
+    ):
+        args.all = True
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    out = args.output_dir
+    if args.all or args.public_surface:
+        write_json(out / "public-surface.json", snapshot_public_surface())
+    if args.all or args.exceptions:
+        write_json(out / "exceptions.json", snapshot_exception_hierarchy())
+    if args.all or args.constants:
+        write_json(out / "constants.json", snapshot_binding_constants())
+    if args.all or args.generated_artifacts:
+        out.mkdir(parents=True, exist_ok=True)
+        snapshot_generated_artifacts(out / "generated-artifacts.md")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Compare the Rust _unicode implementation against the C reference.
+
+Loads apsw's C ``_unicode`` extension and a Rust build of the same
+module, sweeps a corpus of texts through every function pair, and reports
+result mismatches (including differing exceptions).  The sweep is
+partitioned across a process pool; every probe is independent.
+
+Usage::
+
+    python tools/unicode_parity_check.py path/to/_unicode.so
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import functools
+import importlib.util
+import os
+import sys
+from collections import deque
+from pathlib import Path
+
+# Only this many mismatches are kept and reported; an early-stage Rust
+# port can produce thousands, and holding them all helps nobody.
+MAX_REPORTED = 200
+
+# Functions taking (text, offset), probed at every valid offset of every
+# text.  Break functions accept 0..len inclusive; the segment functions
+# demand offset < len.
+BREAK_FNS = (
+    "grapheme_next_break",
+    "word_next_break",
+    "sentence_next_break",
+    "line_next_break",
+)
+
+SEGMENT_FNS = (
+    "grapheme_next",
+    "word_next",
+    "sentence_next",
+)
+
+# Functions taking just (text,).
+TEXT_FNS = (
+    "casefold",
+    "strip",
+    "text_width",
+)
+
+# Deliberately bad (text, offset) inputs.  Error behaviour only needs to
+# be compared once per function, not at every out-of-range offset of the
+# whole corpus.
+ERROR_PROBES = (
+    ("hello", 6),
+    ("hello", -1),
+    ("", 1),
+)
+
+# Sample fed to the position mappers, encoded once: ascii, latin-1 and an
+# astral codepoint so the utf8 and str offsets genuinely diverge.
+STR_SAMPLE = "aé\U0001f642"
+UTF8_SAMPLE = STR_SAMPLE.encode("utf8")
+
+# Corpus swept by every compare() run, with the offset tuples computed
+# once at import; CI drives repeated runs against successive Rust builds
+# out of the same process via the loaders, so this amortizes.
+TEXTS = (
+    "",
+    "hello world",
+    "aé\U0001f642",  # ascii, latin-1, emoji
+    "é́",  # stacked combining accents
+    "مرحبا",  # arabic
+    "नमस्ते",  # devanagari with conjunct
+    "\U0001f1fa\U0001f1f8\U0001f1e9\U0001f1ea",  # regional indicator pairs
+    "line1\r\nline2 line3",
+)
+
+TEXT_OFFSETS = tuple((text, tuple(range(len(text) + 1))) for text in TEXTS)
+
+
+@functools.lru_cache(maxsize=None)
+def load_apsw_module():
+    """Import the C reference implementation."""
+    import apsw._unicode
+
+    return apsw._unicode
+
+
+@functools.lru_cache(maxsize=None)
+def load_rust_unicode(path_str: str):
+    """Load the Rust ``_unicode`` extension from *path_str*.
+
+    Memoized by path so back-to-back compare() runs in one process (a CI
+    driver iterating Rust builds) resolve and execute each extension
+    once.
+    """
+    spec = importlib.util.spec_from_file_location("arsw_unicode", path_str)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"cannot load an extension from {path_str}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def capture(func, *args):
+    """Call ``func(*args)`` and reduce the outcome to a comparable tuple.
+
+    An exception is a legitimate outcome: both implementations must raise
+    the same type for the same input.
+    """
+    try:
+        return ("ok", func(*args))
+    except Exception as exc:
+        return ("raise", type(exc).__name__)
+
+
+def _probe_from_utf8_mapper(mod, data: bytes):
+    mapper = mod.from_utf8_position_mapper(data)
+    return [mapper(i) for i in range(len(data) + 1)]
+
+
+def _probe_to_utf8_mapper(mod, text: str):
+    mapper = mod.to_utf8_position_mapper(text)
+    return [mapper(i) for i in range(len(text) + 1)]
+
+
+# Probes needing a wrapper rather than a direct module function call.
+_PROBE_WRAPPERS = {
+    "from_utf8_position_mapper": _probe_from_utf8_mapper,
+    "to_utf8_position_mapper": _probe_to_utf8_mapper,
+}
+
+
+def _iter_probes():
+    """Yield every (func_name, args) probe descriptor for the corpus.
+
+    Descriptors are plain picklable tuples so batches can cross process
+    boundaries.  Offsets are valid by construction, so the happy path
+    through capture() never pays for an exception; error parity is
+    covered by ERROR_PROBES.
+    """
+    for text, offsets in TEXT_OFFSETS:
+        for offset in offsets:
+            for name in BREAK_FNS:
+                yield name, (text, offset)
+        for offset in offsets[:-1]:
+            for name in SEGMENT_FNS:
+                yield name, (text, offset)
+
+    for name in BREAK_FNS + SEGMENT_FNS:
+        for text, offset in ERROR_PROBES:
+            yield name, (text, offset)
+
+    for name in TEXT_FNS:
+        for text in TEXTS:
+            yield name, (text,)
+
+    yield "from_utf8_position_mapper", (UTF8_SAMPLE,)
+    yield "to_utf8_position_mapper", (STR_SAMPLE,)
+
+
+# Per-process state: the loaded module pair and the function pairs already
+# resolved from it, so each worker binds a name at most once.
+_worker_mods = None
+_worker_fns: dict[str, tuple] = {}
+
+
+def _init_worker(rust_path: str) -> None:
+    global _worker_mods
+    _worker_mods = (load_apsw_module(), load_rust_unicode(rust_path))
+    _worker_fns.clear()
+
+
+def _resolve_pair(name: str) -> tuple:
+    try:
+        return _worker_fns[name]
+    except KeyError:
+        c_mod, r_mod = _worker_mods
+        wrapper = _PROBE_WRAPPERS.get(name)
+        if wrapper is None:
+            pair = (getattr(c_mod, name), getattr(r_mod, name))
+        else:
+            pair = (
+                lambda *args: wrapper(c_mod, *args),
+                lambda *args: wrapper(r_mod, *args),
+            )
+        _worker_fns[name] = pair
+        return pair
+
+
+def _run_batch(probes) -> tuple[list[tuple], int]:
+    mismatches: list[tuple] = []
+    total = 0
+    for name, args in probes:
+        c_fn, r_fn = _resolve_pair(name)
+        c_res = capture(c_fn, *args)
+        r_res = capture(r_fn, *args)
+        if c_res != r_res:
+            total += 1
+            if len(mismatches) < MAX_REPORTED:
+                label = f"{name}({', '.join(map(repr, args))})"
+                mismatches.append((label, c_res, r_res))
+    return mismatches, total
+
+
+def compare(rust_path: Path, jobs: int) -> tuple[list[tuple], int]:
+    probes = list(_iter_probes())
+    if jobs == 1:
+        _init_worker(str(rust_path))
+        return _run_batch(probes)
+
+    chunk = -(-len(probes) // jobs)
+    batches = [probes[i : i + chunk] for i in range(0, len(probes), chunk)]
+    mismatches: deque = deque(maxlen=MAX_REPORTED)
+    total = 0
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(str(rust_path),)
+    ) as executor:
+        for batch_mismatches, batch_total in executor.map(_run_batch, batches):
+            total += batch_total
+            for item in batch_mismatches:
+                if len(mismatches) < MAX_REPORTED:
+                    mismatches.append(item)
+    return list(mismatches), total
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "rust_extension",
+        type=Path,
+        help="path to the built Rust _unicode shared library",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes for the sweep (1 runs in-process)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    mismatches, total = compare(args.rust_extension, max(1, args.jobs))
+    for label, c_res, r_res in mismatches:
+        print(f"MISMATCH {label}: C={c_res!r} Rust={r_res!r}")
+    if total > len(mismatches):
+        print(f"... and {total - len(mismatches)} more")
+    print(f"{total} mismatches")
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())